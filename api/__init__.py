@@ -1,24 +1,31 @@
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from starlette.middleware.cors import CORSMiddleware
 
-from api.routers import (
-    auth,
-    bidders,
-    comparison,
-    initialization,
-    multiplication,
-    reconstruction,
-    redistribution,
-    reset,
-    shares,
-    xor,
-    status,
-)
+from api.dependecies.http import http_session_lifespan
+from api.dependecies.supabase import warm_up_supabase
+from api.middleware.cors import AllowAllCORSMiddleware
+from api.routers import router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The warm-up runs in the background: startup, and the MPC endpoints that
+    # never touch Supabase, must not wait on a slow or unreachable Supabase.
+    # It gets a daemon thread rather than the event loop's executor, which is
+    # joined on shutdown and would leave a hung warm-up blocking the exit.
+    threading.Thread(target=warm_up_supabase, daemon=True).start()
+
+    async with http_session_lifespan(app):
+        yield
+
 
 app = FastAPI(
     title="Secure Multi-Party Computation API",
     version="1.0.0",
     description="API for performing secure multi-party computation protocols.",
+    lifespan=lifespan,
     openapi_tags=[
         {
             "name": "Status",
@@ -67,22 +74,10 @@ app = FastAPI(
     ],
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(AllowAllCORSMiddleware)
+
+app.include_router(router)
 
-app.include_router(status.router)
-app.include_router(auth.router)
-app.include_router(initialization.router)
-app.include_router(shares.router)
-app.include_router(bidders.router)
-app.include_router(redistribution.router)
-app.include_router(multiplication.router)
-app.include_router(xor.router)
-app.include_router(comparison.router)
-app.include_router(reconstruction.router)
-app.include_router(reset.router)
+# Build the OpenAPI schema once at import; FastAPI caches it on the app, so
+# /openapi.json and /docs never pay for walking every route on first hit.
+app.openapi()
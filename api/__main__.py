@@ -0,0 +1,37 @@
+import argparse
+
+import uvicorn
+
+from api.config import KEEPALIVE_TIMEOUT
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an Aukciszek backend server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind to.")
+    parser.add_argument("--port", type=int, default=5001, help="Port to listen on.")
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Reload on code changes and log every request.",
+    )
+    args = parser.parse_args()
+
+    # The MPC state lives in process memory, so each server has to run as a
+    # single worker; uvloop and httptools keep that one event loop cheap.
+    uvicorn.run(
+        "api:app",
+        host=args.host,
+        port=args.port,
+        loop="uvloop",
+        http="httptools",
+        reload=args.debug,
+        access_log=args.debug,
+        log_level="debug" if args.debug else "warning",
+        # Peers reuse pooled connections across protocol rounds, which are
+        # often further apart than uvicorn's 5 second default.
+        timeout_keep_alive=KEEPALIVE_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,16 @@ TRUSTED_IPS = dconfig("TRUSTED_IPS", cast=Csv(str))
 SERVERS = dconfig("SERVERS", cast=Csv(str))
 ALGORITHM = dconfig("ALGORITHM", cast=str)
 ACCESS_TOKEN_EXPIRE_MINUTES = dconfig("ACCESS_TOKEN_EXPIRE_MINUTES", cast=int)
+PEER_CONCURRENCY = dconfig("PEER_CONCURRENCY", cast=int, default=16)
+PEER_TIMEOUT = dconfig("PEER_TIMEOUT", cast=float, default=10)
+RECONSTRUCTION_SPARES = dconfig("RECONSTRUCTION_SPARES", cast=int, default=2)
+# seconds an idle connection between parties stays open; must be the same on
+# every party, since each client assumes its peers' servers keep connections
+# this long
+KEEPALIVE_TIMEOUT = dconfig("KEEPALIVE_TIMEOUT", cast=int, default=75)
+# seconds before the peer's server that a client drops an idle connection, so
+# it never reuses one the server is closing
+KEEPALIVE_MARGIN = 15
 
 
 state = {
@@ -15,6 +25,9 @@ state = {
     "id": None,
     "p": None,
     "parties": None,
+    "peer_parties": None,
+    # sorted uids of the clients that have set their shares
+    "bidders": None,
     # temporary results of arithmetic operations on shares
     "multiplicative_share": None,
     "additive_share": None,
@@ -26,8 +39,11 @@ state = {
         "shared_q": None,
         "shared_u": None,
     },
-    # constant value for multiplication, changes only based on parameters
-    "A": None,
+    # running sums (mod p) of the received q and r shares
+    "shared_q_sum": None,
+    "shared_r_sum": None,
+    # this party's row of matrix A for multiplication, changes only based on parameters
+    "A_row": None,
     # values used for comparison
     "random_number_bit_shares": [],
     "random_number_share": None,
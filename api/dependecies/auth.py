@@ -1,16 +1,15 @@
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from typing import Annotated
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 
 from api.config import ALGORITHM, SECRET_KEYS_JWT, SERVERS
 from api.dependecies.supabase import supabase
 from api.models.parsers import TokenData
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
@@ -34,27 +33,19 @@ def create_access_tokens(data: dict, expires_delta: timedelta | None = None):
 
     encoded_jwt = []
     # Check if SECRET_KEYS_JWT is iterable
-    if isinstance(SECRET_KEYS_JWT, (list, tuple)):
-        for i, secret_key_jwt in enumerate(SECRET_KEYS_JWT):
-            # Check if SERVERS is iterable and has enough items
-            server = (
-                SERVERS[i]
-                if isinstance(SERVERS, (list, tuple)) and i < len(SERVERS)
-                else None
+    if isinstance(SECRET_KEYS_JWT, (list, tuple)) and SECRET_KEYS_JWT:
+        if len(SECRET_KEYS_JWT) != len(SERVERS):
+            raise HTTPException(
+                status_code=400,
+                detail="SECRET_KEYS_JWT and SERVERS must have the same length",
             )
 
-            if len(SECRET_KEYS_JWT) != len(SERVERS):
-                raise HTTPException(
-                    status_code=400,
-                    detail="SECRET_KEYS_JWT and SERVERS must have the same length",
-                )
-
+        algorithm = str(ALGORITHM) if ALGORITHM else None
+        for secret_key_jwt, server in zip(SECRET_KEYS_JWT, SERVERS):
             encoded_jwt.append(
                 {
                     "access_token": jwt.encode(
-                        to_encode,
-                        secret_key_jwt,
-                        algorithm=str(ALGORITHM) if ALGORITHM else None,
+                        to_encode, secret_key_jwt, algorithm=algorithm
                     ),
                     "server": server,
                 }
@@ -63,19 +54,30 @@ def create_access_tokens(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
+@cache
+def get_pwd_context():
+    """
+    Returns the password hashing context.
+    Created on first use, since only the login server hashes passwords.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2"], deprecated="auto")
+
+
 def verify_password(plain_password, hashed_password):
     """
     Verifies a plain password against a hashed password.
     Returns True if the passwords match, otherwise False.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password):
     """
     Hashes a password using the configured hashing algorithm.
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def authenticate_user(email: str, password: str):
@@ -90,7 +92,12 @@ def authenticate_user(email: str, password: str):
             detail="Server is not a login server.",
         )
 
-    user = supabase.table("users").select("*").eq("email", email).execute()
+    user = (
+        supabase.table("users")
+        .select("uid, email, password, isAdmin")
+        .eq("email", email)
+        .execute()
+    )
     if user.data == []:
         return False
     if not verify_password(password, user.data[0].get("password")):
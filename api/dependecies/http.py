@@ -0,0 +1,41 @@
+from contextlib import asynccontextmanager
+
+import aiohttp
+import orjson
+from fastapi import FastAPI, Request
+
+from api.config import KEEPALIVE_MARGIN, KEEPALIVE_TIMEOUT, PEER_TIMEOUT
+
+
+@asynccontextmanager
+async def http_session_lifespan(app: FastAPI):
+    """
+    Opens one aiohttp session for the lifetime of the app so that requests
+    to the other parties reuse pooled keep-alive connections.
+    """
+    # A fan-out never opens more than one connection per peer, so the connector
+    # is not capped. DNS answers keep aiohttp's short default TTL, so a peer
+    # whose address changes is found again without a restart. Idle connections
+    # are kept across protocol rounds, and dropped before the peer's
+    # server-side keep-alive expires.
+    connector = aiohttp.TCPConnector(
+        limit=0, keepalive_timeout=max(KEEPALIVE_TIMEOUT - KEEPALIVE_MARGIN, 1)
+    )
+
+    # A peer that does not answer within PEER_TIMEOUT fails the round instead
+    # of stalling it. Request bodies are encoded with orjson, which raises on
+    # ints wider than 64 bits, so field elements always travel as hex strings.
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=PEER_TIMEOUT),
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+    ) as session:
+        app.state.http_session = session
+        yield
+
+
+def get_http_session(request: Request) -> aiohttp.ClientSession:
+    """
+    Returns the shared session used to talk to the other parties.
+    """
+    return request.app.state.http_session
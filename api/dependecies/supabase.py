@@ -1,5 +1,8 @@
+import logging
+
 from decouple import config as dconfig
-from supabase import create_client
+
+logger = logging.getLogger(__name__)
 
 try:
     SUPABASE_URL = dconfig("SUPABASE_URL", cast=str)
@@ -16,7 +19,26 @@ def get_supabase():
     if not SUPABASE_URL or not SUPABASE_KEY:
         return None
 
+    # Only the login server talks to Supabase, so the client library is
+    # imported here instead of being loaded on every MPC node.
+    from supabase import create_client
+
     return create_client(str(SUPABASE_URL), str(SUPABASE_KEY))
 
 
 supabase = get_supabase()
+
+
+def warm_up_supabase():
+    """
+    Opens the Supabase HTTP connection with a cheap query so the first login
+    does not pay for it. Failures are only logged; the login request reports
+    them to the client.
+    """
+    if supabase is None:
+        return
+
+    try:
+        supabase.table("users").select("uid").limit(1).execute()
+    except Exception as e:
+        logger.warning("Supabase warm-up failed: %s", e)
@@ -0,0 +1,71 @@
+ALLOWED_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+PREFLIGHT_MAX_AGE = b"600"
+
+
+class AllowAllCORSMiddleware:
+    """
+    Minimal CORS middleware that allows every origin, method and header.
+
+    Behaves like Starlette's CORSMiddleware configured with wildcards and
+    credentials, but the response headers are built from constant byte strings
+    and server-to-server requests (which carry no Origin header) pass straight
+    through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        requested_method = None
+        requested_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                requested_method = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+        if scope["method"] == "OPTIONS" and requested_method is not None:
+            cors_headers += [
+                (b"access-control-allow-methods", ALLOWED_METHODS),
+                (b"access-control-max-age", PREFLIGHT_MAX_AGE),
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", b"2"),
+            ]
+            if requested_headers is not None:
+                cors_headers.append(
+                    (b"access-control-allow-headers", requested_headers)
+                )
+
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": cors_headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_with_cors_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors_headers)
@@ -1,24 +1,42 @@
-from pydantic import BaseModel, EmailStr
+from typing import Annotated
+
+from pydantic import BaseModel, BeforeValidator, EmailStr, WithJsonSchema
+
+
+def parse_hex(value):
+    """Parses a hexadecimal string (e.g. "0x1f") into an int."""
+    if not isinstance(value, str):
+        raise ValueError("Value must be a hexadecimal string.")
+
+    return int(value, 16)
+
+
+# Hexadecimal string in the request body, an int once validated.
+HexInt = Annotated[
+    int,
+    BeforeValidator(parse_hex),
+    WithJsonSchema({"type": "string", "examples": ["0x1f"]}),
+]
 
 
 class InitialValuesData(BaseModel):
     """Data model for initial values data."""
 
     id: int
-    p: str
+    p: HexInt
 
 
 class SetClientShareData(BaseModel):
     """Data model for setting client share data."""
 
-    share: str
+    share: HexInt
 
 
 class SetShareData(BaseModel):
     """Data model for setting general share data."""
 
     share_name: str
-    share_value: str
+    share_value: HexInt
 
 
 class AComparisonData(BaseModel):
@@ -48,14 +66,14 @@ class SharedQData(BaseModel):
     """Data model for shared Q values."""
 
     party_id: int
-    shared_q: str
+    shared_q: HexInt
 
 
 class SharedRData(BaseModel):
     """Data model for shared R values."""
 
     party_id: int
-    shared_r: str
+    shared_r: HexInt
 
 
 class RegisterData(BaseModel):
@@ -136,7 +154,7 @@ class SharedUData(BaseModel):
     """Data model for receiving shared U from parties."""
 
     party_id: int
-    shared_u: str
+    shared_u: HexInt
 
 
 class PrepareZTablesData(BaseModel):
@@ -144,7 +162,7 @@ class PrepareZTablesData(BaseModel):
 
     l: int
     k: int
-    opened_a: str
+    opened_a: HexInt
 
 
 class InitializezAndZZData(BaseModel):
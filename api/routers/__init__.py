@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+
+from . import (
+    auth,
+    bidders,
+    comparison,
+    initialization,
+    multiplication,
+    reconstruction,
+    redistribution,
+    reset,
+    shares,
+    status,
+    xor,
+)
+
+router = APIRouter()
+
+# Endpoint modules in registration order. Starlette tries routes in this
+# order, so the routers hit on every round of the protocol come first and the
+# one-off setup/auth ones last.
+for module in (
+    redistribution,
+    shares,
+    multiplication,
+    xor,
+    comparison,
+    reconstruction,
+    initialization,
+    bidders,
+    reset,
+    auth,
+    status,
+):
+    router.include_router(module.router)
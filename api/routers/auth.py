@@ -1,9 +1,14 @@
+import asyncio
 from datetime import timedelta
 
 from fastapi import APIRouter, HTTPException, status
 
 from api.config import ACCESS_TOKEN_EXPIRE_MINUTES
-from api.dependecies.auth import authenticate_user, create_access_tokens, pwd_context
+from api.dependecies.auth import (
+    authenticate_user,
+    create_access_tokens,
+    get_password_hash,
+)
 from api.dependecies.supabase import supabase
 from api.models.parsers import AuthenticationResponse, LoginData, RegisterData
 
@@ -74,26 +79,31 @@ async def register(user_req_data: RegisterData):
         )
 
     user = (
-        supabase.table("users").select("*").eq("email", user_req_data.email).execute()
+        supabase.table("users").select("uid").eq("email", user_req_data.email).execute()
     )
 
     if user.data == []:
-        supabase.table("users").insert(
-            {
-                "email": user_req_data.email,
-                "password": pwd_context.hash(user_req_data.password),
-                "isAdmin": user_req_data.is_admin,
-            }
-        ).execute()
+        # argon2 hashing is deliberately slow; keep it off the event loop.
+        password_hash = await asyncio.to_thread(
+            get_password_hash, user_req_data.password
+        )
+        # The insert returns the stored row, uid included, so it is not re-read.
+        user = (
+            supabase.table("users")
+            .insert(
+                {
+                    "email": user_req_data.email,
+                    "password": password_hash,
+                    "isAdmin": user_req_data.is_admin,
+                }
+            )
+            .execute()
+        )
     else:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Email already registered."
         )
 
-    user = (
-        supabase.table("users").select("*").eq("email", user_req_data.email).execute()
-    )
-
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_tokens = create_access_tokens(
         data={
@@ -145,7 +155,10 @@ async def login(user_req_data: LoginData):
     - `email`: The email address of the user.
     - `password`: The password of the user.
     """
-    user = authenticate_user(user_req_data.email, user_req_data.password)
+    # Verifying the argon2 hash is deliberately slow; keep it off the event loop.
+    user = await asyncio.to_thread(
+        authenticate_user, user_req_data.email, user_req_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from api.config import state
 from api.dependecies.auth import get_current_user
 from api.models.parsers import BiddersResponse, TokenData
-from api.utils.utils import validate_initialized, validate_initialized_shares
+from api.utils.utils import validate_initialized
 
 router = APIRouter(
     prefix="/api",
@@ -52,11 +52,6 @@ async def get_bidders(current_user: Annotated[TokenData, Depends(get_current_use
             detail="You do not have permission to access this resource.",
         )
 
-    validate_initialized(["n"])
-    validate_initialized_shares(["client_shares"])
+    validate_initialized(["n", "bidders"])
 
-    bidders = sorted(
-        [item[0] for item in state.get("shares", {}).get("client_shares", [])]
-    )
-
-    return {"bidders": bidders}
+    return {"bidders": state["bidders"]}
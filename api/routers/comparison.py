@@ -1,4 +1,3 @@
-import asyncio
 from typing import Annotated
 
 import aiohttp
@@ -6,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from api.config import state
 from api.dependecies.auth import get_current_user
+from api.dependecies.http import get_http_session
 from api.models.parsers import (
     AComparisonData,
     InitializezAndZZData,
@@ -15,7 +15,8 @@ from api.models.parsers import (
 )
 from api.utils.utils import (
     binary,
-    send_post_request,
+    send_to_parties,
+    store_own_share,
     validate_initialized,
     validate_initialized_shares,
     validate_initialized_shares_array,
@@ -93,7 +94,7 @@ async def calculate_a_comparison(
     validate_initialized(["random_number_share"])
     validate_initialized_shares(["client_shares"])
 
-    if len(state.get("shares", {}).get("client_shares", [])) < 2:
+    if len(state.get("shares", {}).get("client_shares", {})) < 2:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="At least two client shares must be configured.",
@@ -105,22 +106,9 @@ async def calculate_a_comparison(
             detail="Client IDs must be different.",
         )
 
-    first_client_share = next(
-        (
-            y
-            for x, y in state.get("shares", {}).get("client_shares", [])
-            if x == values.first_client_id
-        ),
-        None,
-    )
-    second_client_share = next(
-        (
-            y
-            for x, y in state.get("shares", {}).get("client_shares", [])
-            if x == values.second_client_id
-        ),
-        None,
-    )
+    client_shares = state.get("shares", {}).get("client_shares", {})
+    first_client_share = client_shares.get(values.first_client_id)
+    second_client_share = client_shares.get(values.second_client_id)
 
     if first_client_share is None or second_client_share is None:
         raise HTTPException(
@@ -129,9 +117,9 @@ async def calculate_a_comparison(
         )
 
     state["shares"]["comparison_a"] = (
-        pow(2, values.l + values.k + 1)
+        (1 << (values.l + values.k + 1))
         - state.get("random_number_share", 0)
-        + pow(2, values.l)
+        + (1 << values.l)
         + first_client_share
         - second_client_share
     )
@@ -180,19 +168,12 @@ async def prepare_z_tables(
             detail="You do not have permission to access this resource.",
         )
 
-    a_bin = binary(int(values.opened_a, 16))
-
-    while len(a_bin) < values.l + values.k:
-        a_bin.append(0)
+    state["comparison_a_bits"] = binary(values.opened_a, values.l + values.k)
 
-    state["comparison_a_bits"] = a_bin
-
-    state["z_table"] = [None for _ in range(values.l)]
-    state["Z_table"] = [None for _ in range(values.l)]
-
-    for i in range(values.l - 1, -1, -1):
-        state["z_table"][i] = state.get("comparison_a_bits", [])[i]
-        state["Z_table"][i] = state.get("comparison_a_bits", [])[i]
+    # Both tables start as the l lowest bits of a, but later hold shares mod p,
+    # so they are lists rather than slices of the bytearray.
+    state["z_table"] = list(state["comparison_a_bits"][: values.l])
+    state["Z_table"] = list(state["comparison_a_bits"][: values.l])
 
     return {
         "result": "Z tables prepared successfully.",
@@ -309,7 +290,9 @@ async def calculate_additive_share_of_z_table_arguments(
     },
 )
 async def calculate_r_of_z_table(
-    index: int, current_user: Annotated[TokenData, Depends(get_current_user)]
+    index: int,
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    session: Annotated[aiohttp.ClientSession, Depends(get_http_session)],
 ):
     """
     Calculates r for the multiplication of the Z table at the specified index and distributes it.
@@ -320,7 +303,7 @@ async def calculate_r_of_z_table(
             detail="You do not have permission to access this resource.",
         )
 
-    validate_initialized(["p", "A", "n", "id"])
+    validate_initialized(["p", "A_row", "n", "id", "parties"])
     validate_initialized_shares_array(["shared_q"])
 
     if index < 0 or index >= len(state.get("comparison_a_bits", [])):
@@ -343,33 +326,19 @@ async def calculate_r_of_z_table(
             detail="Invalid share names provided.",
         )
 
-    qs = [x for x in state.get("shares", {}).get("shared_q", [])]
+    p = state["p"]
+    multiplied_shares = (first_share * second_share + state["shared_q_sum"]) % p
 
-    multiplied_shares = ((first_share * second_share) + sum(qs)) % state.get("p", 0)
+    r = [(multiplied_shares * a) % p for a in state["A_row"]]
 
-    r = [
-        (multiplied_shares * state.get("A", 0)[state.get("id", 0) - 1][i])
-        % state.get("p", 0)
-        for i in range(state.get("n", 0))
-    ]
+    store_own_share("shared_r", r[state["id"] - 1], "shared_r_sum")
 
     # Distribute r values to other parties
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for i in range(state.get("n", 0)):
-            if i == state.get("id", 0) - 1:
-                state["shares"]["shared_r"][i] = r[i]
-                continue
-
-            url = f"{state['parties'][i]}/api/receive-r-from-parties"
-            json_data = {"party_id": state.get("id", None), "shared_r": hex(r[i])}
-            tasks.append(send_post_request(session, url, json_data))
-
-        await asyncio.gather(*tasks)
-
-        return {
-            "result": f"R for multipication of z table at index {index} calculated and shared"
-        }
+    await send_to_parties(session, "/api/receive-r-from-parties", "shared_r", r)
+
+    return {
+        "result": f"R for multiplication of z table at index {index} calculated and shared"
+    }
 
 
 @router.put(
@@ -11,9 +11,7 @@ from api.models.parsers import (
     TokenData,
 )
 from api.utils.utils import (
-    binary_exponentiation,
-    inverse_matrix_mod,
-    multiply_matrix,
+    compute_A_row,
     validate_initialized,
     validate_not_initialized,
 )
@@ -96,7 +94,7 @@ async def set_initial_values(
     n = len(SERVERS)
     t = (n - 1) // 2
 
-    if int(values.p, 16) <= 0:
+    if values.p <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Prime number must be positive.",
@@ -107,14 +105,20 @@ async def set_initial_values(
             "t": t,
             "n": n,
             "id": values.id,
-            "p": int(values.p, 16),
+            "p": values.p,
             "parties": SERVERS,
+            "bidders": [],
+            "peer_parties": [
+                party for i, party in enumerate(SERVERS) if i != values.id - 1
+            ],
             "shares": {
-                "client_shares": [],
+                "client_shares": {},
                 "shared_r": [None] * n,
                 "shared_q": [None] * n,
                 "shared_u": [None] * n,
             },
+            "shared_q_sum": 0,
+            "shared_r_sum": 0,
         }
     )
 
@@ -182,7 +186,7 @@ async def get_initial_values(_: Annotated[TokenData, Depends(get_current_user)])
     "/calculate-A",
     status_code=status.HTTP_201_CREATED,
     summary="Calculate matrix A for MPC protocol",
-    response_description="Matrix A computed via modular inversion and matrix multiplication.",
+    response_description="This party's row of matrix A computed and stored.",
     response_model=ResultResponse,
     responses={
         201: {
@@ -219,7 +223,10 @@ async def get_initial_values(_: Annotated[TokenData, Depends(get_current_user)])
 )
 async def calculate_A(current_user: Annotated[TokenData, Depends(get_current_user)]):
     """
-    Calculates matrix A using the inverse of a generated matrix B and modular operations.
+    Calculates this party's row of the degree-reduction matrix A = B^-1 * P * B
+    and stores it in state['A_row']. The row is the party's Lagrange basis
+    polynomial over the points 1..n, truncated to degree t - 1 and evaluated
+    at 1..n.
     """
 
     if not current_user.is_admin:
@@ -228,26 +235,11 @@ async def calculate_A(current_user: Annotated[TokenData, Depends(get_current_use
             detail="You do not have permission to access this resource.",
         )
 
-    validate_initialized(["t", "n", "p"])
-    validate_not_initialized(["A"])
+    validate_initialized(["t", "n", "p", "id"])
+    validate_not_initialized(["A_row"])
 
-    # Generate matrix B
-    B = [list(range(1, state.get("n", 0) + 1)) for _ in range(state.get("n", 0))]
-    for j in range(state.get("n", 0)):
-        for k in range(state.get("n", 0)):
-            B[j][k] = binary_exponentiation(B[j][k], j, state.get("p", 0))
-
-    # Compute inverse of B
-    B_inv = inverse_matrix_mod(B, state.get("p", 0))
-
-    # Generate matrix P
-    P = [[0] * state.get("n", 0) for _ in range(state.get("n", 0))]
-    for i in range(state.get("t", 0)):
-        P[i][i] = 1
-
-    # Compute matrix A
-    state["A"] = multiply_matrix(
-        multiply_matrix(B_inv, P, state.get("p", 0)), B, state.get("p", 0)
+    state["A_row"] = compute_A_row(
+        state.get("n", 0), state.get("t", 0), state.get("p", 0), state.get("id", 0)
     )
 
     return {"result": "Matrix A calculated successfully."}
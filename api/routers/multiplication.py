@@ -61,11 +61,7 @@ async def calculate_multiplicative_share(
     validate_initialized(["n", "p"])
     validate_initialized_shares_array(["shared_r"])
 
-    state["multiplicative_share"] = sum(
-        [
-            state.get("shares", {}).get("shared_r", 0)[i]
-            for i in range(state.get("n", 0))
-        ]
-    ) % state.get("p", 0)
+    # The r shares are summed as they arrive; the check above ensures all are in.
+    state["multiplicative_share"] = state.get("shared_r_sum", 0)
 
     return {"result": "Multiplicative share calculated"}
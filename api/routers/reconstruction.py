@@ -1,16 +1,17 @@
-import asyncio
 from random import sample
 from typing import Annotated
 
 import aiohttp
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from api.config import TRUSTED_IPS, state
+from api.config import RECONSTRUCTION_SPARES, TRUSTED_IPS, state
 from api.dependecies.auth import get_current_user
+from api.dependecies.http import get_http_session
 from api.models.parsers import ReconstructSecret, ReturnCalculatedShare, TokenData
 from api.utils.utils import (
     computate_coefficients,
     reconstruct_secret,
+    run_first,
     send_get_request,
     validate_initialized,
     validate_initialized_shares,
@@ -132,6 +133,7 @@ async def get_share_to_reconstruct(share_to_reconstruct: str, request: Request):
 async def return_secret(
     share_to_reconstruct: str,
     current_user: Annotated[TokenData, Depends(get_current_user)],
+    session: Annotated[aiohttp.ClientSession, Depends(get_http_session)],
 ):
     """
     Reconstructs the secret from the available calculated shares.
@@ -145,39 +147,40 @@ async def return_secret(
             detail="You do not have permission to access this resource.",
         )
 
-    validate_initialized(["parties", "id", "t", "p"])
+    validate_initialized(["peer_parties", "id", "t", "p"])
     validate_initialized_shares([share_to_reconstruct])
 
-    parties = [
-        party
-        for i, party in enumerate(state.get("parties", []))
-        if i != state.get("id", 0) - 1
-    ]
-    selected_parties = sample(parties, state.get("t", 0) - 1)
+    # Ask a few spare parties as well and use the first t - 1 answers, so one
+    # slow or unreachable party does not hold up the reconstruction.
+    peer_parties = state["peer_parties"]
+    needed = state["t"] - 1
+    selected_parties = sample(
+        peer_parties, min(len(peer_parties), needed + RECONSTRUCTION_SPARES)
+    )
 
-    async with aiohttp.ClientSession() as session:
-        calculated_shares = []
-        tasks = []
-        for party in selected_parties:
-            url = f"{party}/api/return-share-to-reconstruct/{share_to_reconstruct}"
-            tasks.append(send_get_request(session, url))
+    calculated_shares = []
+    tasks = []
+    for party in selected_parties:
+        url = f"{party}/api/return-share-to-reconstruct/{share_to_reconstruct}"
+        tasks.append(send_get_request(session, url))
 
-        results = await asyncio.gather(*tasks)
-
-        for result in results:
-            calculated_shares.append(
-                (result.get("id"), int(result.get("share_to_reconstruct"), 16))
-            )
+    results = await run_first(tasks, needed)
 
+    for result in results:
         calculated_shares.append(
-            (
-                state.get("id", None),
-                state.get("shares", {}).get(share_to_reconstruct, 0),
-            )
+            (result.get("id"), int(result.get("share_to_reconstruct"), 16))
+        )
+
+    calculated_shares.append(
+        (
+            state.get("id", None),
+            state.get("shares", {}).get(share_to_reconstruct, 0),
         )
+    )
 
-        coefficients = computate_coefficients(calculated_shares, state.get("p", 0))
+    p = state["p"]
+    coefficients = computate_coefficients(calculated_shares, p)
 
-        secret = reconstruct_secret(calculated_shares, coefficients, state.get("p", 0))
+    secret = reconstruct_secret(calculated_shares, coefficients, p)
 
-        return {"secret": hex(secret % state.get("p", 0))}
+    return {"secret": hex(secret % p)}
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Annotated
 
 import aiohttp
@@ -6,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from api.config import TRUSTED_IPS, state
 from api.dependecies.auth import get_current_user
+from api.dependecies.http import get_http_session
 from api.models.parsers import (
     RData,
     ResultResponse,
@@ -17,7 +17,9 @@ from api.models.parsers import (
 from api.utils.utils import (
     Shamir,
     secure_randint,
-    send_post_request,
+    send_to_parties,
+    store_own_share,
+    store_party_share,
     validate_initialized,
     validate_initialized_shares,
     validate_initialized_shares_array,
@@ -60,7 +62,10 @@ router = APIRouter(
         },
     },
 )
-async def redistribute_q(current_user: Annotated[TokenData, Depends(get_current_user)]):
+async def redistribute_q(
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    session: Annotated[aiohttp.ClientSession, Depends(get_http_session)],
+):
     """
     Computes 'q' shares using a Shamir scheme and distributes them to all participating parties.
     """
@@ -73,22 +78,14 @@ async def redistribute_q(current_user: Annotated[TokenData, Depends(get_current_
     validate_initialized(["t", "n", "p", "id", "parties"])
     validate_initialized_shares(["shared_q"])
 
-    q = Shamir(2 * state.get("t", 0), state.get("n", 0), 0, state.get("p", 0))
-
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for i in range(state.get("n", 0)):
-            if i == state.get("id", 0) - 1:
-                state["shares"]["shared_q"][i] = q[i][1]
-                continue
+    p = state["p"]
+    q = [share for _, share in Shamir(2 * state["t"], state["n"], 0, p)]
 
-            url = f"{state['parties'][i]}/api/receive-q-from-parties"
-            json_data = {"party_id": state.get("id", None), "shared_q": hex(q[i][1])}
-            tasks.append(send_post_request(session, url, json_data))
+    store_own_share("shared_q", q[state["id"] - 1], "shared_q_sum")
 
-        await asyncio.gather(*tasks)
+    await send_to_parties(session, "/api/receive-q-from-parties", "shared_q", q)
 
-        return {"result": "q calculated and shared"}
+    return {"result": "q calculated and shared"}
 
 
 @router.post(
@@ -170,21 +167,8 @@ async def set_received_q(values: SharedQData, request: Request):
 
     validate_initialized_shares(["shared_q"])
 
-    if (
-        values.party_id > len(state.get("shares", {}).get("shared_q", []))
-        or values.party_id < 1
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid party id."
-        )
-
-    if state.get("shares", {}).get("shared_q", [])[values.party_id - 1] is not None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="q is already set from this party.",
-        )
-
-    state["shares"]["shared_q"][values.party_id - 1] = int(values.shared_q, 16)
+    store_party_share("shared_q", values.party_id, values.shared_q, "q")
+    state["shared_q_sum"] = (state["shared_q_sum"] + values.shared_q) % state["p"]
 
     return {"result": "q received"}
 
@@ -223,7 +207,9 @@ async def set_received_q(values: SharedQData, request: Request):
     },
 )
 async def redistribute_r(
-    values: RData, current_user: Annotated[TokenData, Depends(get_current_user)]
+    values: RData,
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    session: Annotated[aiohttp.ClientSession, Depends(get_http_session)],
 ):
     """
     Calculates and distributes the 'r' shares to all participating parties, based on previously distributed 'q' shares.
@@ -239,7 +225,7 @@ async def redistribute_r(
         )
 
     # Validate required state variables
-    validate_initialized(["n", "p", "t", "id", "parties", "A"])
+    validate_initialized(["n", "p", "t", "id", "parties", "A_row"])
     validate_initialized_shares(["shared_r"])
     validate_initialized_shares_array(["shared_q"])
 
@@ -252,31 +238,17 @@ async def redistribute_r(
             detail="Invalid share names provided.",
         )
 
-    qs = [x for x in state.get("shares", {}).get("shared_q", [])]
+    p = state["p"]
+    multiplied_shares = (first_share * second_share + state["shared_q_sum"]) % p
 
-    multiplied_shares = ((first_share * second_share) + sum(qs)) % state.get("p", 0)
+    r = [(multiplied_shares * a) % p for a in state["A_row"]]
 
-    r = [
-        (multiplied_shares * state.get("A", 0)[state.get("id", 0) - 1][i])
-        % state.get("p", 0)
-        for i in range(state.get("n", 0))
-    ]
+    store_own_share("shared_r", r[state["id"] - 1], "shared_r_sum")
 
     # Distribute r values to other parties
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for i in range(state.get("n", 0)):
-            if i == state.get("id", 0) - 1:
-                state["shares"]["shared_r"][i] = r[i]
-                continue
-
-            url = f"{state['parties'][i]}/api/receive-r-from-parties"
-            json_data = {"party_id": state.get("id", None), "shared_r": hex(r[i])}
-            tasks.append(send_post_request(session, url, json_data))
-
-        await asyncio.gather(*tasks)
+    await send_to_parties(session, "/api/receive-r-from-parties", "shared_r", r)
 
-        return {"result": "r calculated and shared"}
+    return {"result": "r calculated and shared"}
 
 
 @router.post(
@@ -357,21 +329,8 @@ async def set_received_r(values: SharedRData, request: Request):
     # to ensure that only the party with the correct IP can set the value
     # validate_initialized_shares(["shared_r"])
 
-    if (
-        values.party_id > len(state.get("shares", {}).get("shared_r", []))
-        or values.party_id < 1
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid party id."
-        )
-
-    if state.get("shares", {}).get("shared_r", [])[values.party_id - 1] is not None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="r is already set from this party.",
-        )
-
-    state["shares"]["shared_r"][values.party_id - 1] = int(values.shared_r, 16)
+    store_party_share("shared_r", values.party_id, values.shared_r, "r")
+    state["shared_r_sum"] = (state["shared_r_sum"] + values.shared_r) % state["p"]
 
     return {"result": "r received"}
 
@@ -409,7 +368,10 @@ async def set_received_r(values: SharedRData, request: Request):
         },
     },
 )
-async def redistribute_u(current_user: Annotated[TokenData, Depends(get_current_user)]):
+async def redistribute_u(
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    session: Annotated[aiohttp.ClientSession, Depends(get_http_session)],
+):
     """
     Calculates and distributes the 'u' shares to all participating parties.
     """
@@ -422,27 +384,15 @@ async def redistribute_u(current_user: Annotated[TokenData, Depends(get_current_
     validate_initialized(["t", "n", "p", "id", "parties"])
     validate_initialized_shares(["shared_u"])
 
-    u = Shamir(
-        state.get("t", 0),
-        state.get("n", 0),
-        secure_randint(1, state.get("p", 0)),
-        state.get("p", 0),
-    )
-
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for i in range(state.get("n", 0)):
-            if i == state.get("id", 0) - 1:
-                state["shares"]["shared_u"][i] = u[i][1]
-                continue
+    p = state["p"]
+    u = [share for _, share in Shamir(state["t"], state["n"], secure_randint(1, p), p)]
 
-            url = f"{state['parties'][i]}/api/receive-u-from-parties"
-            json_data = {"party_id": state.get("id", None), "shared_u": hex(u[i][1])}
-            tasks.append(send_post_request(session, url, json_data))
+    i = state["id"] - 1
+    state["shares"]["shared_u"][i] = u[i]
 
-        await asyncio.gather(*tasks)
+    await send_to_parties(session, "/api/receive-u-from-parties", "shared_u", u)
 
-        return {"result": "u calculated and shared"}
+    return {"result": "u calculated and shared"}
 
 
 @router.post(
@@ -532,7 +482,7 @@ async def receive_u_from_parties(values: SharedUData, request: Request):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid party id."
         )
 
-    state["shares"]["shared_u"][values.party_id - 1] = int(values.shared_u, 16)
+    state["shares"]["shared_u"][values.party_id - 1] = values.shared_u
 
     return {"result": "u received"}
 
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from api.config import state
 from api.dependecies.auth import get_current_user
 from api.models.parsers import ResultResponse, TokenData
-from api.utils.utils import validate_initialized
+from api.utils.utils import clear_shares_arrays, validate_initialized
 
 router = APIRouter(
     prefix="/api",
@@ -65,16 +65,12 @@ async def reset_calculation(
             "multiplicative_share": None,
             "additive_share": None,
             "xor_share": None,
+            "shared_q_sum": 0,
+            "shared_r_sum": 0,
         }
     )
 
-    state["shares"].update(
-        {
-            "shared_r": [None] * state.get("n", 0),
-            "shared_q": [None] * state.get("n", 0),
-            "shared_u": [None] * state.get("n", 0),
-        }
-    )
+    clear_shares_arrays(["shared_r", "shared_q", "shared_u"])
 
     return {"result": "Reset calculation successful"}
 
@@ -137,6 +133,8 @@ async def reset_comparison(
                 "shared_q": [None] * state.get("n", 0),
                 "shared_u": [None] * state.get("n", 0),
             },
+            "shared_q_sum": 0,
+            "shared_r_sum": 0,
             "random_number_bit_shares": [],
             "random_number_share": None,
             "comparison_a": None,
@@ -192,6 +190,8 @@ async def factory_reset(current_user: Annotated[TokenData, Depends(get_current_u
             "id": None,
             "p": None,
             "parties": None,
+            "peer_parties": None,
+            "bidders": None,
             "multiplicative_share": None,
             "additive_share": None,
             "xor_share": None,
@@ -203,7 +203,9 @@ async def factory_reset(current_user: Annotated[TokenData, Depends(get_current_u
                 "u": None,
                 "v": None,
             },
-            "A": None,
+            "shared_q_sum": None,
+            "shared_r_sum": None,
+            "A_row": None,
             "random_number_bit_shares": [],
             "random_number_share": None,
             "comparison_a": None,
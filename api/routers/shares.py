@@ -1,3 +1,4 @@
+from bisect import insort
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -68,23 +69,14 @@ async def set_client_shares(
 
     validate_initialized_shares(["client_shares"])
 
-    if (
-        next(
-            (
-                x
-                for x, _ in state.get("shares", {}).get("client_shares", [])
-                if x == current_user.uid
-            ),
-            None,
-        )
-        is not None
-    ):
+    if current_user.uid in state.get("shares", {}).get("client_shares", {}):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Shares already set for this client.",
         )
 
-    state["shares"]["client_shares"].append((current_user.uid, int(values.share, 16)))
+    state["shares"]["client_shares"][current_user.uid] = values.share
+    insort(state["bidders"], current_user.uid)
     return {"result": "Shares set"}
 
 
@@ -191,7 +183,7 @@ async def set_shares(
             detail="You do not have permission to access this resource.",
         )
 
-    state["shares"][values.share_name] = int(values.share_value, 16)
+    state["shares"][values.share_name] = values.share_value
 
     return {"result": f"Share {values.share_name} set successfully."}
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 
 from api.models.parsers import StatusResponse
 
@@ -7,6 +7,10 @@ router = APIRouter(
     tags=["Status"],
 )
 
+# The status body never changes, so it is encoded once and returned as-is,
+# skipping response-model validation and serialization on every probe.
+STATUS_BODY = b'{"status":"OK"}'
+
 
 @router.get(
     "/status",
@@ -23,4 +27,4 @@ router = APIRouter(
     },
 )
 async def get_status():
-    return {"status": "OK"}
+    return Response(content=STATUS_BODY, media_type="application/json")
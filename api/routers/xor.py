@@ -231,22 +231,12 @@ async def calculate_share_of_random_number(
             detail="You do not have permission to access this resource.",
         )
 
-    def multiply_bit_shares_by_powers_of_2(shares):
-        multiplied_shares = []
-        for i in range(len(shares)):
-            multiplied_shares.append(2**i * shares[i])
-        return multiplied_shares
-
-    def add_multiplied_shares(multiplied_shares):
-        value_of_share_r = multiplied_shares[0]
-        for i in range(1, len(multiplied_shares)):
-            value_of_share_r += multiplied_shares[i]
-        return value_of_share_r % state.get("p", 0)
-
-    pom = multiply_bit_shares_by_powers_of_2(state.get("random_number_bit_shares", []))
-    share_of_random_number = add_multiplied_shares(pom)
-
-    state["random_number_share"] = share_of_random_number
+    # sum(2**i * share_i) evaluated with Horner's rule: shift, then add.
+    share_of_random_number = 0
+    for bit_share in reversed(state.get("random_number_bit_shares", [])):
+        share_of_random_number = (share_of_random_number << 1) + bit_share
+
+    state["random_number_share"] = share_of_random_number % state.get("p", 0)
 
     return {
         "result": "Share of random number calculated successfully.",
@@ -1,20 +1,29 @@
-import copy
+import asyncio
+import logging
 import os
+from functools import lru_cache
 
 import aiohttp
 from fastapi import HTTPException
 
-from api.config import state
+from api.config import PEER_CONCURRENCY, state
+
+logger = logging.getLogger(__name__)
+
+# Marks a key missing from state, so each check needs only one dict lookup.
+MISSING = object()
 
 
 def validate_not_initialized(required_keys):
     for key in required_keys:
-        if key not in state:
+        value = state.get(key, MISSING)
+
+        if value is MISSING:
             raise HTTPException(
                 status_code=400, detail=f"state does not contain {key}."
             )
 
-        if state[key] is not None:
+        if value is not None:
             raise HTTPException(
                 status_code=400, detail=f"state['{key}'] is already initialized."
             )
@@ -22,12 +31,14 @@ def validate_not_initialized(required_keys):
 
 def validate_initialized(required_keys):
     for key in required_keys:
-        if key not in state:
+        value = state.get(key, MISSING)
+
+        if value is MISSING:
             raise HTTPException(
                 status_code=400, detail=f"state does not contain {key}."
             )
 
-        if state[key] is None:
+        if value is None:
             raise HTTPException(
                 status_code=400, detail=f"state['{key}'] is not initialized."
             )
@@ -76,6 +87,48 @@ def validate_initialized_shares_array(required_keys):
                 )
 
 
+def clear_shares_arrays(keys):
+    """Sets every slot of the given state['shares'] arrays back to None in place."""
+    for key in keys:
+        shares = state["shares"][key]
+        for i in range(len(shares)):
+            shares[i] = None
+
+
+def store_party_share(key, party_id, value, name):
+    """
+    Stores the share received from party `party_id` in state['shares'][key],
+    refusing unknown parties and a second share from the same party. There is
+    no await between the check and the write, so concurrent deliveries on the
+    event loop cannot interleave.
+    """
+    shares = state["shares"][key]
+
+    if party_id > len(shares) or party_id < 1:
+        raise HTTPException(status_code=400, detail="Invalid party id.")
+
+    if shares[party_id - 1] is not None:
+        raise HTTPException(
+            status_code=400, detail=f"{name} is already set from this party."
+        )
+
+    shares[party_id - 1] = value
+
+
+def store_own_share(key, value, sum_key):
+    """
+    Stores this party's own share in state['shares'][key] and keeps the running
+    sum in state[sum_key] in step with it. A retried round overwrites the slot,
+    so the previous value is taken back out of the sum before the new one is
+    added.
+    """
+    shares = state["shares"][key]
+    i = state["id"] - 1
+    previous = shares[i] or 0
+    shares[i] = value
+    state[sum_key] = (state[sum_key] - previous + value) % state["p"]
+
+
 async def send_post_request(session, url, json_data=None, headers=None):
     """Send a POST request asynchronously."""
     try:
@@ -89,6 +142,8 @@ async def send_post_request(session, url, json_data=None, headers=None):
                 )
 
             return message
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Request to {url} timed out.")
     except aiohttp.ClientError as e:
         raise HTTPException(
             status_code=400, detail=f"HTTP error occurred for {url}: {e}"
@@ -112,6 +167,8 @@ async def send_get_request(session, url, params=None, headers=None):
                 )
 
             return message
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Request to {url} timed out.")
     except aiohttp.ClientError as e:
         raise HTTPException(
             status_code=400, detail=f"HTTP error occurred for {url}: {e}"
@@ -122,28 +179,106 @@ async def send_get_request(session, url, params=None, headers=None):
         )
 
 
-def binary_internal(n):
-    return n > 0 and [n & 1] + binary_internal(n >> 1) or []
+async def run_limited(semaphore, coroutine):
+    """
+    Awaits coroutine once semaphore lets it through. A coroutine cancelled
+    while still waiting is closed, so it is not reported as never awaited.
+    """
+    try:
+        async with semaphore:
+            return await coroutine
+    finally:
+        coroutine.close()
+
 
+async def run_concurrently(coroutines, limit=PEER_CONCURRENCY):
+    """
+    Run coroutines concurrently, at most `limit` at a time, and return their
+    results in order. The first failure cancels the rest and is re-raised.
+    """
+    # Nothing to schedule, or nothing to run alongside: skip the task group.
+    if len(coroutines) < 2:
+        return [await coroutine for coroutine in coroutines]
 
-def binary(n):
-    if n == 0:
-        return [0]
-    else:
-        return binary_internal(n)
+    semaphore = asyncio.Semaphore(limit)
 
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(run_limited(semaphore, c)) for c in coroutines
+            ]
+    except ExceptionGroup as e:
+        raise e.exceptions[0]
+
+    return [task.result() for task in tasks]
+
+
+async def send_to_parties(session, endpoint, name, values):
+    """
+    Sends values[i] as hex field `name` to the `endpoint` of party i + 1, for
+    every party except this one, concurrently.
+    """
+    party_id = state["id"]
+    tasks = []
+    for i, party in enumerate(state["parties"]):
+        if i == party_id - 1:
+            continue
+
+        json_data = {"party_id": party_id, name: hex(values[i])}
+        tasks.append(send_post_request(session, f"{party}{endpoint}", json_data))
+
+    await run_concurrently(tasks)
+
+
+async def run_first(coroutines, count, limit=PEER_CONCURRENCY):
+    """
+    Run coroutines concurrently, at most `limit` at a time, and return the
+    first `count` successful results in completion order, cancelling the rest.
+    Every failure is logged; the last one is raised if fewer than `count`
+    succeed. A request cancelled mid-flight closes its pooled connection, so
+    each spare that loses the race costs a new connection next round.
+    """
+    if count <= 0:
+        for coroutine in coroutines:
+            coroutine.close()
+        return []
+
+    semaphore = asyncio.Semaphore(limit)
+    tasks = [
+        asyncio.create_task(run_limited(semaphore, coroutine))
+        for coroutine in coroutines
+    ]
+    results = []
+    error = None
+
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            try:
+                results.append(await next_result)
+            except Exception as e:
+                logger.warning("Request failed: %s", e)
+                error = e
+                continue
+
+            if len(results) == count:
+                return results
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Wait for the cancelled tasks and retrieve every failure, so none is
+        # left behind as "Task exception was never retrieved".
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if error is None:
+        raise HTTPException(
+            status_code=400, detail=f"Expected {count} results, got {len(results)}."
+        )
+    raise error
 
-def binary_exponentiation(b, k, n):
-    if k < 0:
-        k = n - 2
 
-    a = 1
-    while k:
-        if k & 1:
-            a = (a * b) % n
-        b = (b * b) % n
-        k >>= 1
-    return a
+def binary(n, min_len=0):
+    """Little-endian bits of n as a bytearray, zero-padded to at least min_len."""
+    return bytearray((n >> i) & 1 for i in range(max(n.bit_length(), 1, min_len)))
 
 
 def modular_multiplicative_inverse(b: int, n: int) -> int:
@@ -160,104 +295,64 @@ def modular_multiplicative_inverse(b: int, n: int) -> int:
     return U
 
 
-def inverse_matrix_mod(matrix_dc, modulus):
-    matrix_dc = copy.deepcopy(matrix_dc)
+@lru_cache(maxsize=256)
+def lagrange_coefficients(xs, p):
+    """Lagrange coefficients at 0 for the points xs, cached per (xs, p)."""
+    numerators = []
+    denominators = []
 
-    n = len(matrix_dc)
-    identity_matrix = [[1 if i == j else 0 for j in range(n)] for i in range(n)]
-
-    for i in range(n):
-        # Find the first non-zero element in column i starting from row i
-        non_zero_index = next(
-            (k for k in range(i, n) if matrix_dc[k][i] % modulus != 0), -1
-        )
-        if non_zero_index == -1:
-            raise HTTPException(
-                status_code=400,
-                detail="Matrix is not invertible mod p.",
-            )
-
-        # Swap rows i and non_zero_index in both matrix and identity_matrix
-        matrix_dc[i], matrix_dc[non_zero_index] = (
-            matrix_dc[non_zero_index],
-            matrix_dc[i],
-        )
-        identity_matrix[i], identity_matrix[non_zero_index] = (
-            identity_matrix[non_zero_index],
-            identity_matrix[i],
-        )
-
-        # Normalize the pivot row
-        pivot = matrix_dc[i][i] % modulus
-        pivot_inv = modular_multiplicative_inverse(pivot, modulus)
-
-        matrix_dc[i] = [(x * pivot_inv) % modulus for x in matrix_dc[i]]
-        identity_matrix[i] = [(x * pivot_inv) % modulus for x in identity_matrix[i]]
-
-        # Eliminate entries below the pivot
-        for j in range(i + 1, n):
-            if matrix_dc[j][i] % modulus != 0:
-                factor = matrix_dc[j][i]
-                matrix_dc[j] = [
-                    (matrix_dc[j][k] - factor * matrix_dc[i][k]) % modulus
-                    for k in range(n)
-                ]
-                identity_matrix[j] = [
-                    (identity_matrix[j][k] - factor * identity_matrix[i][k]) % modulus
-                    for k in range(n)
-                ]
-
-    # Back substitution to eliminate entries above the pivots
-    for i in range(n - 1, -1, -1):
-        for j in range(i - 1, -1, -1):
-            if matrix_dc[j][i] % modulus != 0:
-                factor = matrix_dc[j][i]
-                matrix_dc[j] = [
-                    (matrix_dc[j][k] - factor * matrix_dc[i][k]) % modulus
-                    for k in range(n)
-                ]
-                identity_matrix[j] = [
-                    (identity_matrix[j][k] - factor * identity_matrix[i][k]) % modulus
-                    for k in range(n)
-                ]
-
-    return identity_matrix
-
-
-def multiply_matrix(matrix1, matrix2, modulus):
-    n = len(matrix1)
-    m = len(matrix2[0])
-    l = len(matrix2)
-
-    if len(matrix1[0]) != l:
-        raise HTTPException(
-            status_code=400,
-            detail="Matrix dimensions do not match for multiplication.",
-        )
-
-    result = [[0 for _ in range(m)] for _ in range(n)]
-
-    for i in range(n):
-        for j in range(m):
-            result[i][j] = (
-                sum(matrix1[i][k] * matrix2[k][j] % modulus for k in range(l)) % modulus
-            )
-
-    return result
+    for i, x_i in enumerate(xs):
+        numerator = denominator = 1
+        for j, x_j in enumerate(xs):
+            if i != j:
+                numerator = numerator * x_j % p
+                denominator = denominator * (x_j - x_i) % p
+        numerators.append(numerator)
+        denominators.append(denominator)
+
+    # Montgomery's trick: invert all denominators with a single inversion.
+    prefix = [1]
+    for denominator in denominators:
+        prefix.append(prefix[-1] * denominator % p)
+
+    inverse = pow(prefix[-1], -1, p)
+    coefficients = [0] * len(xs)
+
+    for i in range(len(xs) - 1, -1, -1):
+        coefficients[i] = numerators[i] * prefix[i] % p * inverse % p
+        inverse = inverse * denominators[i] % p
+
+    return tuple(coefficients)
+
+
+@lru_cache(maxsize=16)
+def compute_A_row(n, t, p, id):
+    """
+    Row `id` of matrix A = B^-1 * P * B used to reduce the degree of a product
+    of shares, cached per (n, t, p, id).
+    """
+    # Row id of B^-1 holds the coefficients of the Lagrange basis polynomial
+    # L_id over the points 1..n, and P * B truncates it to degree t - 1 and
+    # evaluates it at 1..n. Only the t lowest coefficients of the numerator
+    # prod_{m != id} (x - m) are ever needed, so higher ones are never kept.
+    coefficients = [1] + [0] * (t - 1)
+    denominator = 1
+    for m in range(1, n + 1):
+        if m != id:
+            for k in range(t - 1, 0, -1):
+                coefficients[k] = (coefficients[k - 1] - m * coefficients[k]) % p
+            coefficients[0] = -m * coefficients[0] % p
+            denominator = denominator * (id - m) % p
+
+    inverse = pow(denominator, -1, p)
+    coefficients = [c * inverse % p for c in coefficients]
+
+    return tuple(f(x, coefficients, p, t) for x in range(1, n + 1))
 
 
 def computate_coefficients(shares, p):
-    coefficients = []
-
-    for i, (x_i, _) in enumerate(shares):
-        li = 1
-        for j, (x_j, _) in enumerate(shares):
-            if i != j:
-                li *= x_j * binary_exponentiation(x_j - x_i, -1, p)
-                li %= p
-        coefficients.append(li)
-
-    return coefficients
+    # The coefficients depend only on which parties answered, not on the shares.
+    return list(lagrange_coefficients(tuple(x for x, _ in shares), p))
 
 
 def reconstruct_secret(shares, coefficients, p):
@@ -289,19 +384,17 @@ def secure_randint(start, end):
 
 
 def f(x, coefficients, p, t):
-    return sum([coefficients[i] * x**i for i in range(t)]) % p
+    # Horner's rule: one multiplication and one addition per coefficient.
+    y = 0
+    for a in reversed(coefficients[:t]):
+        y = (y * x + a) % p
+    return y
 
 
 def Shamir(t, n, k0, p):
-    coefficients = [secure_randint(0, p - 1) for _ in range(t)]
-    coefficients[0] = k0
+    coefficients = [k0] + [secure_randint(0, p - 1) for _ in range(t - 1)]
 
     if coefficients[-1] == 0:
         coefficients[-1] = secure_randint(1, p - 1)
 
-    shares = []
-
-    for i in range(1, n + 1):
-        shares.append((i, f(i, coefficients, p, t)))
-
-    return shares
+    return [(i, f(i, coefficients, p, t)) for i in range(1, n + 1)]